@@ -0,0 +1,74 @@
+"""
+Measures how long the one-shot subcommands of fear_server_utils.py take to run from a cold interpreter start.
+Each subcommand is run as a separate process several times, and the fastest and median wall times are reported
+next to a bare interpreter start so the overhead of the script itself is easy to see.
+
+Usage:
+    python3 benchmarks/bench_startup.py [<number of runs>]
+"""
+import marshal
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fear_server_utils.py')
+
+
+def time_command(command: list, runs: int) -> list:
+    """
+    Runs a command the given number of times and returns how long each run took in milliseconds.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> int:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        checkpoint_file_path = os.path.join(temporary_directory, 'checkpoint.dat')
+        player_data_file_path = os.path.join(temporary_directory, 'players.csv')
+
+        player = {
+            'game_name': 'boblol',
+            'connect_time': '2023-12-02 19:26:18',
+            'ip_port': '11.11.11.11:48421',
+            'ping': '24.1ms',
+            'site_name': 'Example_Player3',
+            'sec2_cd_verified': 'True',
+            'guid': '6d93222a373ba18ec93222a373ba18ec'
+        }
+        with open(checkpoint_file_path, 'wb') as checkpoint_file:
+            marshal.dump({
+                'checkpoint_time': time.time(),
+                'current_world': 'Example_World',
+                'world_start_time': '2023-12-02 19:20:00',
+                'world_start_timestamp': time.time(),
+                'server_status_state': '[GOOD]',
+                'players_connected': [player] * 16
+            }, checkpoint_file)
+        with open(player_data_file_path, 'w') as player_data_file:
+            for _ in range(1000):
+                player_data_file.write(','.join(player.values()) + '\n')
+
+        commands = {
+            'python (no script)': [sys.executable, '-c', 'pass'],
+            'status': [sys.executable, SCRIPT_PATH, 'status', checkpoint_file_path],
+            'history': [sys.executable, SCRIPT_PATH, 'history', player_data_file_path, 'boblol'],
+        }
+
+        for name, command in commands.items():
+            timings = time_command(command, runs)
+            print(f'{name:<20} min {min(timings):7.2f}ms   median {statistics.median(timings):7.2f}ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
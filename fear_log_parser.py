@@ -0,0 +1,158 @@
+import re
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Pattern
+from typing import Tuple
+
+# Prefix and suffix constants
+LOADING_WORLD_PREFIX = 'Loading world'
+WORLD_LOADED_PREFIX = 'World loaded'
+CLIENT_CONNECTED_SUFFIX = 'Client connected\n'
+CLIENT_DISCONNECTED_SUFFIX = 'Client disconnected\n'
+PASSED_SEC2_CD_KEY_CHECK_SUFFIX = 'Client passed cd-key check [SEC2]\n'
+
+# Regex patterns. These are compiled once when the module is imported, so only the subcommands that actually
+# parse log files (the live monitor) pay for importing re and compiling them.
+DISPLAY_NAME_INDICATOR_PATTERN = re.compile(r'\[INFO\].*-- Display Name:')
+GUID_INDICATOR_PATTERN = re.compile(r'\[INFO\]: guid:')
+DISPLAY_NAME_PATTERN = re.compile(r'-- Display Name:\s*(\S+)')
+GAME_NAME_INFO_PATTERN = re.compile(r'\[((?:\[.*?\]|[^\[\]])*)\]\s*\[INFO\]:')
+GAME_NAME_CHAT_PATTERN = re.compile(r'\[((?:\[.*?\]|[^\[\]])*)\]\s*\[CHAT\]:')
+GAME_NAME_PATTERN = re.compile(r'\[((?:\[.*?\]|[^\[\]])*)\]\s*\[(?:CHAT|INFO)\]:')
+GUID_PATTERN = re.compile(r'guid:\s*(\S+)')
+CHAT_INDICATOR_PATTERN = re.compile(r'\[CHAT\]:')
+IP_PATTERN = re.compile(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})')
+WORLD_NAME_PATTERN = re.compile(r'\\(\w+)\n')
+
+# Event kinds yielded by parse_log_lines
+LOAD_WORLD_EVENT = 'load_world'
+WORLD_LOADED_EVENT = 'world_loaded'
+CLIENT_CONNECTED_EVENT = 'client_connected'
+DISPLAY_NAME_EVENT = 'display_name'
+SEC2_PASSED_EVENT = 'sec2_passed'
+GUID_EVENT = 'guid'
+CLIENT_DISCONNECTED_EVENT = 'client_disconnected'
+CHAT_EVENT = 'chat'
+
+
+class LogEvent(NamedTuple):
+    """
+    A single parsed line from the log file. Fields that do not apply to an event kind are None.
+
+    Attributes:
+        kind (str): One of the *_EVENT constants in this module.
+        game_name (str): The in-game name of the player the line is about.
+        log_time (str): The time column of the line.
+        ip_port (str): The IP:Port column of the line.
+        ping (str): The ping column of the line.
+        value (str): The world name, display name or GUID, depending on the kind of event.
+        line (str): The original log file line, only for error messages. To keep events small, it is only set when
+            the Server will not be able to apply the event (a world line with no world name, or a display name,
+            SEC2 or GUID line with no game name).
+    """
+    kind: str
+    game_name: Optional[str] = None
+    log_time: Optional[str] = None
+    ip_port: Optional[str] = None
+    ping: Optional[str] = None
+    value: Optional[str] = None
+    line: Optional[str] = None
+
+
+def get_game_name(log_file_line: str, regex_pattern: Pattern) -> Optional[str]:
+    """
+    This functions extracts the player's "game name" or the name that shows in game from a log file line.
+
+    Args:
+        log_file_line (str): Log file line generated from the UNIX FEAR server to extract a game name from
+        regex_pattern (re.Pattern): If a specific precompiled Regex pattern is needed for a certain line, this can be
+        specified here.
+
+    Returns:
+        str: The game name, or None if the line did not have one.
+    """
+    game_name = regex_pattern.search(log_file_line)
+    if game_name:
+        return game_name.group(1)
+    else:
+        return None
+
+
+def get_columns(log_file_line: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    The log file contains columns separated by brackets. This splits the time, IP:Port and ping columns out of a
+    log file line.
+
+    Args:
+        log_file_line (str): Log file line generated from the UNIX FEAR server.
+
+    Returns:
+        tuple: The time, IP:Port and ping columns. Any column that is missing from the line is None.
+    """
+    columns = log_file_line.split(']')
+    if len(columns) < 3:
+        return None, None, None
+    return columns[0][1:], columns[1][2:], columns[2][2:]
+
+
+def parse_log_lines(log_file_lines: Iterable[str]) -> Iterator[LogEvent]:
+    """
+    Goes line by line through a log file generated from the UNIX FEAR server and yields an event for every line
+    that changes the status of the server. Lines that do not matter are skipped. This does not change any state,
+    so it can be used on any source of lines (an open file, a list, lines read on another thread, etc.), and the
+    events can then be applied to a Server with Server.apply_events.
+
+    Args:
+        log_file_lines (Iterable[str]): Lines from the log file, including their newline characters.
+
+    Yields:
+        LogEvent: The parsed event for each line that matters.
+    """
+    for line in log_file_lines:
+
+        if line.startswith(LOADING_WORLD_PREFIX):
+            # Find the name of the world at the end of the loading worlds line
+            world_name_match = WORLD_NAME_PATTERN.search(line)
+            world_name = world_name_match.group(1) if world_name_match else None
+            yield LogEvent(LOAD_WORLD_EVENT, value=world_name, line=None if world_name else line)
+            continue
+
+        if line.startswith(WORLD_LOADED_PREFIX):
+            yield LogEvent(WORLD_LOADED_EVENT)
+            continue
+
+        if line.endswith(CLIENT_CONNECTED_SUFFIX):
+            log_time, ip_port, ping = get_columns(line)
+            yield LogEvent(CLIENT_CONNECTED_EVENT, get_game_name(line, GAME_NAME_INFO_PATTERN), log_time, ip_port, ping)
+            continue
+
+        if DISPLAY_NAME_INDICATOR_PATTERN.search(line):
+            game_name = get_game_name(line, GAME_NAME_INFO_PATTERN)
+            display_name = DISPLAY_NAME_PATTERN.search(line)
+            yield LogEvent(DISPLAY_NAME_EVENT, game_name, value=display_name.group(1) if display_name else None,
+                           line=None if game_name else line)
+            continue
+
+        if line.endswith(PASSED_SEC2_CD_KEY_CHECK_SUFFIX):
+            game_name = get_game_name(line, GAME_NAME_INFO_PATTERN)
+            yield LogEvent(SEC2_PASSED_EVENT, game_name, line=None if game_name else line)
+            continue
+
+        if GUID_INDICATOR_PATTERN.search(line):
+            game_name = get_game_name(line, GAME_NAME_INFO_PATTERN)
+            guid = GUID_PATTERN.search(line)
+            log_time, ip_port, ping = get_columns(line)
+            yield LogEvent(GUID_EVENT, game_name, log_time, ip_port, ping, value=guid.group(1) if guid else None,
+                           line=None if game_name else line)
+            continue
+
+        if line.endswith(CLIENT_DISCONNECTED_SUFFIX):
+            yield LogEvent(CLIENT_DISCONNECTED_EVENT, get_game_name(line, GAME_NAME_PATTERN))
+            continue
+
+        if CHAT_INDICATOR_PATTERN.search(line):
+            log_time, ip_port, ping = get_columns(line)
+            yield LogEvent(CHAT_EVENT, get_game_name(line, GAME_NAME_PATTERN), log_time, ip_port, ping)
+            continue
@@ -0,0 +1,650 @@
+import time
+import datetime
+import os
+import csv
+import marshal
+from typing import List
+from typing import Optional
+from typing import TextIO
+from typing import Union
+from typing import Tuple
+from typing import Callable
+from typing import Iterable
+
+from fear_log_parser import LOAD_WORLD_EVENT
+from fear_log_parser import WORLD_LOADED_EVENT
+from fear_log_parser import CLIENT_CONNECTED_EVENT
+from fear_log_parser import DISPLAY_NAME_EVENT
+from fear_log_parser import SEC2_PASSED_EVENT
+from fear_log_parser import GUID_EVENT
+from fear_log_parser import CLIENT_DISCONNECTED_EVENT
+from fear_log_parser import CHAT_EVENT
+from fear_log_parser import IP_PATTERN
+from fear_log_parser import LogEvent
+from fear_log_parser import parse_log_lines
+
+
+class Server:
+    def __init__(self):
+        self.loading_world_flag: bool = False
+        self.world_being_loaded: Optional[str] = None
+        self.world_start_time_ms: float = 0.00
+        self.world_start_time: datetime = datetime.datetime.now()
+        self.current_world: Optional[str] = None
+        self.players_connected: List[dict] = []
+        self.server_status_state: str = '[GOOD]'
+        self.de_synced_players: set = set()
+        self.last_write_time: datetime = datetime.datetime.now()
+        self.player_data_save_path: Optional[str] = None
+        self.log_file_path: Optional[str] = None
+        self.server_stats_save_path: Optional[str] = None
+        self.subscribers: List[Tuple[Callable[['Server', LogEvent], None], Optional[set]]] = []
+
+    def load_world(self, event: LogEvent) -> str:
+        """
+        Takes in the event for a line from a server log file that starts with 'Loading world', which holds
+        the world name. It then sets the world being loaded to that name.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server to determine the world
+
+        Returns:
+            str: The name of the world that was loaded by the server
+
+        Raises:
+            ValueError: The world failed to load or the wrong line was read somehow
+        """
+        self.loading_world_flag = True
+
+        # if the parser found the world name, set this to the name of the world being loaded.
+        if event.value:
+            self.world_being_loaded = event.value
+            return event.value
+        else:
+            error_message = (f"The load_world function attempted to load a world and failed." +
+                             f"\nLog file line:{event.line}")
+            self.world_being_loaded = 'FAIL_LOAD'
+            raise ValueError(error_message)
+
+    def set_current_world(self) -> None:
+        """
+        Sets the current world of the server to the world that was loaded
+
+        Returns:
+            None: This function does not return anything
+        """
+        if self.loading_world_flag:
+            self.loading_world_flag = False
+            self.current_world = self.world_being_loaded
+            self.world_being_loaded = None
+            self.world_start_time_ms = time.time()
+            self.world_start_time = datetime.datetime.now()
+
+        # In cases where players vote for the same map, the "Loading world" prefix never shows up in the log
+        # which results in the method load_world never being called.
+
+        # This will create a situation where this method is called, but there is no loading flag set. To handle this
+        # We just assume that if this method is called while the loading flag is not set, it must be because
+        # players voted for the same map, which means we just need to reset the time.
+
+        elif not self.loading_world_flag:
+            # if this is the case we just want to reset the time.
+            self.world_start_time_ms = time.time()
+            self.world_start_time = datetime.datetime.now()
+
+    def connect_player(self, event: LogEvent) -> int:
+        """
+        Creates a dictionary object in player_connected that shows the players identity information.
+        This information is later used to produce output to stdout in the terminal window
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server to determine which player to
+            connect
+
+        Returns:
+            int: 1 if a player was added, and 0 if they were not.
+
+        """
+        # Make sure the player connecting is not somehow someone already in the server.
+        # This prevents weird renaming bugs
+        for player in self.players_connected:
+            if player['game_name'] == event.game_name:  # This means the player is already in the server.
+                return 0
+
+        # If we did not hit a match, then this is a new player and we should add them
+        self.players_connected.append({
+            'game_name': event.game_name,
+            'connect_time': event.log_time,
+            'ip_port': event.ip_port,
+            'ping': event.ping,
+            'site_name': None,
+            'sec2_cd_verified': None,
+            'guid': None
+        })
+        return 1
+
+    def disconnect_player(self, event: LogEvent) -> None:
+        """
+        Disconnects a player from the server.
+
+        This function takes a parsed log file line as input and uses the game name found by the parser.
+        It then rebuilds the `players_connected` list, excluding the player who is to be disconnected.
+        This effectively removes the player from the server's list of connected players. There seems to be a bug in
+        the linux server software that allows a player to connect without showing up in the logs, so if the player
+        cannot be found nothing happens.
+
+        Args:
+            event (LogEvent):  Parsed log file line generated from the UNIX FEAR server to
+            determine which player to disconnect
+
+        Returns:
+            None: This function does not return anything
+        """
+        game_name = event.game_name
+
+        # We basically just rebuild the list of dicts here with this comprehension not including
+        # the one that needs to be removed, effectively removing it from the list.
+        self.players_connected =\
+            [player_dict for player_dict in self.players_connected if player_dict['game_name'] != game_name]
+
+    def set_display_name(self, event: LogEvent) -> None:
+        """
+        After a player connects, a new line in the log file is generated that shows their display name. This method
+        captures that display name, and saves it to the player's dict object in players_connected. This allows
+        us to then show this on the terminal. Note that the log file calls it a display name, but it is actually
+        the name the player created their account with on the fear-community.org website. Because of this, we
+        refer to it as the site_name.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server to determine display name for
+            the connecting player.
+
+        Returns:
+            None: This function does not return anything
+
+        Raises:
+            ValueError: The display name line was found, but there was no game name associated with it.
+        """
+        game_name = event.game_name
+
+        if game_name:
+            # Search for that player in the list of player_dict objects
+            for player in self.players_connected:
+                if player['game_name'] == game_name:
+                    if event.value:
+                        player['site_name'] = event.value
+                        break
+                    else:
+                        player['site_name'] = None
+        else:
+            error_message = 'There is no game name associated with this player. Something went wrong' +\
+                f'Log file line: {event.line}'
+            raise ValueError(error_message)
+
+    def set_guid(self, event: LogEvent) -> None:
+        """
+        Each player should be assigned a GUID, and there should be a log file indicated what the GUID is for
+        each player that connected. This function assigned that value to the player inside the players_connected
+        dict so that we have a record of that player's GUID.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server to determine GUID for the
+            connecting player.
+
+        Returns:
+            None: This function does not return anything
+
+        Raises
+            ValueError: If the line did not have any GUID on it, something went wrong.
+        """
+        game_name = event.game_name
+
+        if game_name:
+            # search for that player in the list of player_dict objects
+            for player in self.players_connected:
+                if player['game_name'] == game_name:
+                    if event.value:
+                        player['guid'] = event.value
+                        self.update_player_stats(event)
+                        break
+                    else:
+                        player['guid'] = None
+        else:
+            error_message = f'[WARNING] Unable to set guid for player: {game_name}' +\
+                f'\nLog file line: {event.line}'
+            raise ValueError(error_message)
+
+    def set_sec2_success_flag(self, event: LogEvent) -> None:
+        """
+        When this function runs it assumes that it is being called because a log file line had a SEC2 indicator.
+        Which means the player has verified their SEC2 security key.
+        This function then sets the value of the player's sec2 verification to True.
+        If this function does not get called, the player's verification stays as False.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server to determine if a player
+            has been authorized by SEC2.
+
+        Returns:
+            None: This function does not return anything
+
+        Raises:
+            ValueError: If there is a sec2 line, but no player name, something went wrong.
+        """
+
+        game_name = event.game_name
+
+        if game_name:
+            for player in self.players_connected:
+                if player['game_name'] == game_name:
+                    player['sec2_cd_verified'] = 'True'
+                    break
+        else:
+            error_message = f'[WARNING] Unable to set sec2 pass flag for player: {game_name}' +\
+                f'\nLog file line: {event.line}'
+            raise ValueError(error_message)
+
+    def print_output(self) -> None:
+        """
+        Print out all the information saved in the class attributes to make a nice display about the current
+        status of the server.
+
+        Returns:
+            None: This function does not return anything
+
+        """
+
+        players: List[dict] = self.players_connected
+        total_players: int = len(players)
+        player_lines: str = ""  # Preparing a variable to add the print text later
+        max_players: int = 16  # This is hardcoded because there is no way to determine this. Max is 16 for most servers
+        display_width: int = 149
+
+        # This block is basically building up a string that shows the connected players to display them in the box.
+        if total_players == 0:
+            player_lines = f'│{"":<{display_width}}│'
+        else:
+            for i, player in enumerate(players):
+
+                # Because this is only printing values, we want to ensure that all values are strings
+                # some may be None if players circumvented the websites name requirement.
+                name = str(player['game_name'])
+                connect_time = str(player['connect_time'])
+                ip_port = str(player['ip_port'])
+                ping = str(player['ping'])
+                site_name = str(player['site_name'])
+                sec2_cd_verified = str(player['sec2_cd_verified'])
+                guid = str(player['guid'])
+
+                # Format the line for the current player
+                # :<8 and other numbers are used to keep things aligned with the f string formatting
+                player_line = f"│{name:<22}{site_name:<33}{connect_time:<21}{ip_port:<23}{ping:<10}{sec2_cd_verified:<7}{guid:<33}│"
+
+                # Add newline character only if it's not the last player
+                if i < total_players - 1:
+                    player_line += "\n"
+
+                player_lines += player_line
+
+        world_time_elapsed = str(self.calculate_world_time_elapsed())
+        world_start_time = str(self.world_start_time)
+        current_map = str(self.current_world)
+        server_status_state = str(self.server_status_state)
+        player_count = str(len(self.players_connected)) + '/' + str(max_players)
+
+        os.system('clear')
+
+        print(f"""
+┌─────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────┐
+│{'Server Status: ' + server_status_state:<{display_width}}│
+├─────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────┤
+│{'Current Map: ' + current_map:<{display_width}}│
+│{'Map Start Time: ' + world_start_time:<{display_width}}│
+│{'Map Time Elapsed: ' + world_time_elapsed:<{display_width}}│ 
+│{'Players: ' + player_count:<{display_width}}│
+│                                                                                                                                                     │ 
+│Player Details                                                                                                                                       │
+├─────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────┤
+│Name                  Site Name                        Connect Time         IP:Port                Ping      SEC2   GUID                             │
+├─────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────┤
+{player_lines}
+└─────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────────┘
+        \n""")
+
+    def check_bugged_players(self, event: LogEvent) -> None:
+        """
+        There is a bug with the linux server application where it will sometimes not log
+        the client disconnect message. Possibly if the player crashes or alt f4. The exact reason isn't know
+        but this causes there to be a player who is ALWAYS on the server even when they aren't
+        we need to delete this player so that they don't keep messing up stats for historical data
+        for now the only solution I can think is to delete them from the players list after 12 hours.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server that triggered the check.
+
+        Returns:
+            None: This function does not return anything
+        """
+
+        # Ages are measured against the time on the log line rather than the current time. The whole log is
+        # replayed every time the monitor starts, and old sessions would otherwise all look bugged.
+        if event.log_time is None:
+            return
+        try:
+            current_time: datetime = datetime.datetime.strptime(event.log_time, '%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            return
+
+        still_connected_players: List[dict] = []
+
+        for players in self.players_connected:
+            player_connect_time: Optional[str] = players['connect_time']
+
+            # Players with no connect time can't be checked, and the player on this line is clearly still here,
+            # so leave them connected.
+            if player_connect_time is not None and players['game_name'] != event.game_name:
+                formatted_player_connect_time: datetime =\
+                    datetime.datetime.strptime(player_connect_time, '%Y-%m-%d %H:%M:%S')
+
+                time_difference: datetime = current_time - formatted_player_connect_time
+                difference_in_seconds: float = time_difference.days*24*60*60 + time_difference.seconds
+
+                # If the player has been in the server for 12 hours, assume they're bugged and remove them
+                if difference_in_seconds >= 43200:
+                    continue
+
+            still_connected_players.append(players)
+
+        self.players_connected = still_connected_players
+
+    def check_for_renamed_player(self, event: LogEvent) -> None:
+        """
+        The server does not log when people change their nickname in game
+        This means that if they change their nickname, then leave the server,
+        the original name for that player will appear to be connected to the server still because
+        the disconnect method was never called for the original nickname,
+        even though they are not in the server. I don't know a way around this for now, but
+        this at least tells us when it's happening
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server with the game name from the
+            log line.
+
+        Returns:
+            None: This function does not return anything
+        """
+
+        list_of_apparent_connected_players = []
+        for players in self.players_connected:
+            list_of_apparent_connected_players.append(players['game_name'])
+
+        game_name = event.game_name
+
+        # Something is wrong if we have a name that's not connected.
+        # If the name is None we don't care, so we check if the game_name is a truthy value
+        if game_name not in list_of_apparent_connected_players and game_name:
+            self.server_status_state = '[WARNING] Unlisted Player(s) In Server!'
+            self.de_synced_players.add(game_name)
+
+    def calculate_world_time_elapsed(self) -> str:
+        """
+        Uses the current time to calculate how much time has passed in the current map. If no players are in the game
+        the timer will go up forever, as the map does not change with no players in the server.
+
+        Returns:
+            str: A nicely formatted time string in the format minutes:seconds to pass to the print_output method
+
+        """
+        world_start_time = self.world_start_time
+        time_elapsed = datetime.datetime.now() - world_start_time
+        seconds_elapsed = time_elapsed.days*24*60*60 + time_elapsed.seconds
+        world_time_minutes_passed = int(seconds_elapsed // 60)
+        world_time_seconds_passed = int(seconds_elapsed % 60)
+        formatted_time = '{:02}:{:02}'.format(world_time_minutes_passed, world_time_seconds_passed)
+        return formatted_time
+
+    def save_player(self, event: LogEvent, player_data_file_path: str) -> bool:
+        """
+        Whenever a new player enters the server, check a locally stored CSV file to see if they already exist in the
+        file. If they don't add all of that player's information that was stored in the players connected dictionary
+        as a new row in the CSV file. The function checks the game_name, ip, guid, and display_name. If any one
+        of these 4 values is different, we treat this a new player.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server with the player's game name
+            player_data_file_path (str): The path to where the CSV file is saved.
+
+        Returns:
+            bool: True if the player was already in the CSV file, False if not. Also False if the player is not
+            connected, in which case nothing is saved.
+        """
+
+        player_name = event.game_name
+        player_details = [player for player in self.players_connected if player['game_name'] == player_name]
+
+        # Monitoring can start partway through a log file, so the player may never have been seen connecting.
+        if len(player_details) == 0:
+            return False
+        player_dict = player_details[0]
+
+        if player_dict['site_name'] is None:
+            player_dict['site_name'] = 'NA'
+
+        if not os.path.exists(player_data_file_path):
+            f = open(player_data_file_path, "w")
+            f.close()
+
+        # Used to see if the file is empty or not. If the file is empty, then don't check to see if a player is in it.
+        file_size = os.stat(player_data_file_path).st_size
+
+        with open(player_data_file_path, newline='') as read_file:
+            reader = csv.reader(read_file)
+
+            # Just add the next value because nothing is in this file
+            if file_size == 0:
+                pass
+            else:
+                for row in reader:
+
+                    row_ip = IP_PATTERN.search(row[2]).group(1)
+                    player_ip = IP_PATTERN.search(player_dict['ip_port']).group(1)
+
+                    # Player already exists in file
+                    if row[0] == player_dict['game_name'] and row_ip == player_ip and \
+                            (row[4] == player_dict['site_name']) and row[6] == player_dict['guid']:
+                        return True  # player already in list, stop the function
+                    # otherwise add player
+
+        with open(player_data_file_path, 'a') as save_file:
+            w = csv.DictWriter(save_file, player_dict.keys())
+            w.writerow(player_dict)
+        return False
+
+    def update_player_stats(self, event: LogEvent) -> None:
+        """
+        Because there is no way of knowing the player's current status in the server (such as ping, kills, deaths etc.)
+        We need to be clever on how we "update" their status. Log file lines with CHAT or INFO will contain
+        information about the player that we can use to update their current status. This function updates the status
+        of the player when one of these lines is encountered. For now the only thing we update is the player's ping.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server with the game name and ping
+            from the log line.
+
+        Returns:
+            None: This function does not return anything
+
+        """
+        if event.ping is None:
+            return
+
+        for players in self.players_connected:
+            if players['game_name'] == event.game_name:
+                players['ping'] = event.ping
+
+    def subscribe(self, callback: Callable[['Server', LogEvent], None], event_kinds: Optional[set] = None) -> None:
+        """
+        Registers a sink (such as saving players to the player data file) that is called with the server and the
+        event every time an event has been applied to the server. This keeps side effects like writing files out of
+        the methods that update the status of the server.
+
+        Args:
+            callback (Callable): Function that takes the server and the event that was just applied.
+            event_kinds (set): The kinds of event the callback should be called for. If None, it is called for all.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        self.subscribers.append((callback, event_kinds))
+
+    def apply_event(self, event: LogEvent) -> None:
+        """
+        Updates the current status of the server with a single event from fear_log_parser.parse_log_lines, and
+        then passes the event on to any subscribed sinks.
+
+        Args:
+            event (LogEvent): Parsed log file line generated from the UNIX FEAR server.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        kind = event.kind
+
+        if kind == LOAD_WORLD_EVENT:
+            self.load_world(event)
+        elif kind == WORLD_LOADED_EVENT:
+            self.set_current_world()
+        elif kind == CLIENT_CONNECTED_EVENT:
+            self.connect_player(event)
+        elif kind == DISPLAY_NAME_EVENT:
+            self.set_display_name(event)
+        elif kind == SEC2_PASSED_EVENT:
+            self.set_sec2_success_flag(event)
+        elif kind == GUID_EVENT:
+            self.set_guid(event)
+        elif kind == CLIENT_DISCONNECTED_EVENT:
+            self.check_for_renamed_player(event)
+            self.check_bugged_players(event)
+            self.disconnect_player(event)
+        elif kind == CHAT_EVENT:
+            self.check_for_renamed_player(event)
+            self.check_bugged_players(event)
+            self.update_player_stats(event)
+
+        for callback, event_kinds in self.subscribers:
+            if event_kinds is None or kind in event_kinds:
+                callback(self, event)
+
+    def apply_events(self, events: Iterable[LogEvent]) -> None:
+        """
+        Updates the current status of the server with every event from an iterable of events.
+
+        Args:
+            events (Iterable[LogEvent]): Parsed log file lines, usually from fear_log_parser.parse_log_lines.
+
+        Returns:
+            None: This function does not return anything.
+        """
+        for event in events:
+            self.apply_event(event)
+
+    def parse_logs(self, log_file_lines: Union[List[str], TextIO]) -> None:
+        """
+        This takes in a log file generated from the UNIX FEAR server, parses it line by line, and applies the events
+        to update the current status of the server.
+
+        Args:
+            log_file_lines (TextIO): All lines from the log file.
+
+        Returns:
+            None: This function does not return anything.
+
+        """
+        self.apply_events(parse_log_lines(log_file_lines))
+
+    @staticmethod
+    def read_new_lines(filepath: str, last_read_position: int) -> Tuple[int, List[str]]:
+        """
+        Reads new lines from the file that were added after the last_read_position.
+
+        Args:
+            filepath (str): Path to the file.
+            last_read_position (int): The position in the file from where to start reading.
+
+        Returns:
+            tuple: A tuple containing the updated last_read_position and a list of new lines.
+        """
+        new_lines = []
+        current_size = os.path.getsize(filepath)
+
+        if current_size > last_read_position:
+            with open(filepath, 'r', errors='replace') as file:
+                file.seek(last_read_position)
+                new_lines = file.readlines()
+                last_read_position = current_size
+
+        return last_read_position, new_lines
+
+    def save_server_stats(self, save_file_path: str) -> None:
+        """
+        Saves the date, the time, ping information, and the current number of players in the server every 30 seconds.
+
+        Args:
+            save_file_path: Location to save the data in CSV format
+
+        Returns:
+            None: This function does not return anything.
+
+        """
+
+        current_time_stamp: datetime = datetime.datetime.now()
+
+        if (current_time_stamp - self.last_write_time).total_seconds() >= 30:
+            current_date = current_time_stamp.date()
+            current_time = current_time_stamp.time()
+            num_players_in_server = len(self.players_connected)
+            current_pings = [float(players['ping'][:-2]) for players in self.players_connected]
+            if len(current_pings) == 0:
+                min_ping, max_ping, average_ping = 0, 0, 0
+            else:
+                min_ping = min(current_pings)
+                max_ping = max(current_pings)
+                average_ping = sum(current_pings) / len(current_pings)
+
+            self.last_write_time = datetime.datetime.now()
+
+            csv_line = current_date.strftime("%m-%d-%Y") + ',' + current_time.strftime("%H:%M:%S") + ',' +\
+                str(num_players_in_server) + ',' + str(min_ping) + ',' + str(max_ping) + ',' + str(average_ping) + '\n'
+
+            with open(save_file_path, "a") as csv_file:
+                csv_file.write(csv_line)
+        else:
+            pass
+
+    def save_checkpoint(self, checkpoint_file_path: str) -> None:
+        """
+        Saves a snapshot of the current status of the server. This lets short-lived processes (such as cron jobs)
+        query the state of the server with the status subcommand, without having to import the parser and replay the
+        whole log file themselves. marshal is used instead of json because it is built into the interpreter, while
+        importing json also imports re. The file is written to a temporary path first and then moved into place so
+        that readers never see a half written checkpoint.
+
+        Args:
+            checkpoint_file_path (str): Location to save the checkpoint
+
+        Returns:
+            None: This function does not return anything.
+        """
+        checkpoint = {
+            'checkpoint_time': time.time(),
+            'current_world': self.current_world,
+            'world_start_time': str(self.world_start_time),
+            'world_start_timestamp': self.world_start_time.timestamp(),
+            'server_status_state': self.server_status_state,
+            'players_connected': self.players_connected
+        }
+
+        temporary_file_path = checkpoint_file_path + '.tmp'
+        with open(temporary_file_path, 'wb') as checkpoint_file:
+            marshal.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_file_path, checkpoint_file_path)
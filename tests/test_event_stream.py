@@ -0,0 +1,172 @@
+import os
+import tempfile
+import unittest
+
+from fear_log_parser import LOAD_WORLD_EVENT
+from fear_log_parser import WORLD_LOADED_EVENT
+from fear_log_parser import CLIENT_CONNECTED_EVENT
+from fear_log_parser import DISPLAY_NAME_EVENT
+from fear_log_parser import SEC2_PASSED_EVENT
+from fear_log_parser import GUID_EVENT
+from fear_log_parser import CLIENT_DISCONNECTED_EVENT
+from fear_log_parser import CHAT_EVENT
+from fear_log_parser import LogEvent
+from fear_log_parser import parse_log_lines
+from fear_server import Server
+
+NOW = '2023-12-02 19:26:18'
+
+SAMPLE_LOG = [
+    'Loading world Worlds\\Retail\\Multiplayer\\DM_Dockyard\n',
+    'World loaded\n',
+    f'[{NOW}] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: Client connected\n',
+    f'[{NOW}] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: -- Display Name: Bob\n',
+    f'[{NOW}] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: Client passed cd-key check [SEC2]\n',
+    f'[{NOW}] [11.11.11.11:48421] [30ms] [boblol] [INFO]: guid: abcdef\n',
+    f'[{NOW}] [22.22.22.22:48421] [50ms] [[TAG]x] [INFO]: Client connected\n',
+    f'[{NOW}] [22.22.22.22:48421] [55ms] [[TAG]x] [CHAT]: hello\n',
+    f'[{NOW}] [33.33.33.33:48421] [60ms] [ghost] [CHAT]: boo\n',
+    f'[{NOW}] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: Client disconnected\n',
+    'Some line the parser does not care about\n',
+]
+
+
+class ParseLogLinesTests(unittest.TestCase):
+
+    def test_event_for_each_line_kind(self):
+        events = list(parse_log_lines(SAMPLE_LOG))
+
+        self.assertEqual(events, [
+            LogEvent(LOAD_WORLD_EVENT, value='DM_Dockyard'),
+            LogEvent(WORLD_LOADED_EVENT),
+            LogEvent(CLIENT_CONNECTED_EVENT, 'boblol', NOW, '11.11.11.11:48421', '24.1ms'),
+            LogEvent(DISPLAY_NAME_EVENT, 'boblol', value='Bob'),
+            LogEvent(SEC2_PASSED_EVENT, 'boblol'),
+            LogEvent(GUID_EVENT, 'boblol', NOW, '11.11.11.11:48421', '30ms', value='abcdef'),
+            LogEvent(CLIENT_CONNECTED_EVENT, '[TAG]x', NOW, '22.22.22.22:48421', '50ms'),
+            LogEvent(CHAT_EVENT, '[TAG]x', NOW, '22.22.22.22:48421', '55ms'),
+            LogEvent(CHAT_EVENT, 'ghost', NOW, '33.33.33.33:48421', '60ms'),
+            LogEvent(CLIENT_DISCONNECTED_EVENT, 'boblol'),
+        ])
+
+    def test_world_line_with_no_world_name(self):
+        line = 'Loading world nowhere\n'
+        events = list(parse_log_lines([line]))
+
+        self.assertEqual(events, [LogEvent(LOAD_WORLD_EVENT, value=None, line=line)])
+
+    def test_line_is_only_kept_when_the_event_cannot_be_applied(self):
+        line = 'guid: abc with no player name [INFO]: guid: abc\n'
+        events = list(parse_log_lines([line]))
+
+        self.assertEqual(events[0].kind, GUID_EVENT)
+        self.assertIsNone(events[0].game_name)
+        self.assertEqual(events[0].line, line)
+
+
+class ApplyEventsTests(unittest.TestCase):
+
+    def test_sample_log(self):
+        server = Server()
+        server.apply_events(parse_log_lines(SAMPLE_LOG))
+
+        self.assertEqual(server.current_world, 'DM_Dockyard')
+        self.assertEqual(server.players_connected, [{
+            'game_name': '[TAG]x',
+            'connect_time': NOW,
+            'ip_port': '22.22.22.22:48421',
+            'ping': '55ms',
+            'site_name': None,
+            'sec2_cd_verified': None,
+            'guid': None
+        }])
+        self.assertEqual(server.de_synced_players, {'ghost'})
+        self.assertEqual(server.server_status_state, '[WARNING] Unlisted Player(s) In Server!')
+
+    def test_guid_updates_ping(self):
+        server = Server()
+        server.apply_events(parse_log_lines(SAMPLE_LOG[:6]))
+
+        player = server.players_connected[0]
+        self.assertEqual(player['site_name'], 'Bob')
+        self.assertEqual(player['sec2_cd_verified'], 'True')
+        self.assertEqual(player['guid'], 'abcdef')
+        self.assertEqual(player['ping'], '30ms')
+
+    def test_bugged_player_is_removed_after_12_hours(self):
+        server = Server()
+        server.apply_events(parse_log_lines([
+            '[2023-12-02 06:00:00] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: Client connected\n',
+            '[2023-12-02 19:00:00] [22.22.22.22:48421] [50ms] [alice] [INFO]: Client connected\n',
+            '[2023-12-02 19:00:05] [22.22.22.22:48421] [55ms] [alice] [CHAT]: hello\n',
+        ]))
+
+        self.assertEqual([player['game_name'] for player in server.players_connected], ['alice'])
+
+    def test_replaying_an_old_log_keeps_everyone_connected(self):
+        # The log is from long before the test runs, but nobody in it was connected for 12 hours
+        server = Server()
+        server.apply_events(parse_log_lines([
+            '[2023-12-02 19:00:00] [11.11.11.11:48421] [24.1ms] [amy] [INFO]: Client connected\n',
+            '[2023-12-02 19:00:10] [22.22.22.22:48421] [50ms] [bob] [INFO]: Client connected\n',
+            '[2023-12-02 19:05:00] [11.11.11.11:48421] [25ms] [amy] [CHAT]: hi\n',
+            '[2023-12-02 19:06:00] [22.22.22.22:48421] [51ms] [bob] [CHAT]: hey\n',
+            '[2023-12-02 19:07:00] [11.11.11.11:48421] [26ms] [amy] [CHAT]: gg\n',
+            '[2023-12-02 19:08:00] [22.22.22.22:48421] [52ms] [bob] [CHAT]: gg\n',
+        ]))
+
+        self.assertEqual([player['game_name'] for player in server.players_connected], ['amy', 'bob'])
+        self.assertEqual(server.server_status_state, '[GOOD]')
+        self.assertEqual(server.de_synced_players, set())
+
+    def test_world_line_with_no_world_name_raises(self):
+        server = Server()
+
+        with self.assertRaises(ValueError):
+            server.apply_events(parse_log_lines(['Loading world nowhere\n']))
+
+
+class SubscribeTests(unittest.TestCase):
+
+    def test_subscribers_are_filtered_by_event_kinds(self):
+        server = Server()
+        guid_events = []
+        all_events = []
+        server.subscribe(lambda subscribed_server, event: guid_events.append(event), {GUID_EVENT})
+        server.subscribe(lambda subscribed_server, event: all_events.append(event))
+
+        server.apply_events(parse_log_lines(SAMPLE_LOG))
+
+        self.assertEqual([event.kind for event in guid_events], [GUID_EVENT])
+        self.assertEqual(guid_events[0].value, 'abcdef')
+        self.assertEqual(len(all_events), 10)
+
+    def test_subscriber_sees_state_after_the_event_is_applied(self):
+        server = Server()
+        guids = []
+        server.subscribe(lambda subscribed_server, event: guids.append(subscribed_server.players_connected[0]['guid']),
+                         {GUID_EVENT})
+
+        server.apply_events(parse_log_lines(SAMPLE_LOG[:6]))
+
+        self.assertEqual(guids, ['abcdef'])
+
+    def test_save_player_sink_skips_unknown_players(self):
+        server = Server()
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            player_data_file_path = os.path.join(temporary_directory, 'players.csv')
+            server.subscribe(
+                lambda subscribed_server, event: subscribed_server.save_player(event, player_data_file_path),
+                {GUID_EVENT})
+
+            # Monitoring started partway through the log, so this player was never seen connecting
+            server.apply_events(parse_log_lines([f'[{NOW}] [11.11.11.11:48421] [30ms] [zed] [INFO]: guid: abc\n']))
+            server.apply_events(parse_log_lines(SAMPLE_LOG[:6]))
+
+            with open(player_data_file_path) as player_data_file:
+                self.assertEqual(player_data_file.read(),
+                                 f'boblol,{NOW},11.11.11.11:48421,30ms,Bob,True,abcdef\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
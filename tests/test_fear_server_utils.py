@@ -0,0 +1,122 @@
+import contextlib
+import io
+import marshal
+import os
+import tempfile
+import unittest
+
+from fear_log_parser import parse_log_lines
+from fear_server import Server
+from fear_server_utils import run_history
+from fear_server_utils import run_status
+
+SAMPLE_LOG = [
+    'Loading world Worlds\\Retail\\Multiplayer\\DM_Dockyard\n',
+    'World loaded\n',
+    '[2023-12-02 19:26:18] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: Client connected\n',
+    '[2023-12-02 19:26:18] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: -- Display Name: Bob\n',
+    '[2023-12-02 19:26:18] [11.11.11.11:48421] [24.1ms] [boblol] [INFO]: Client passed cd-key check [SEC2]\n',
+    '[2023-12-02 19:26:19] [11.11.11.11:48421] [30ms] [boblol] [INFO]: guid: abcdef\n',
+]
+
+PLAYER_DATA_ROWS = [
+    'boblol,2023-12-02 19:26:18,11.11.11.11:48421,30ms,Bob,True,abcdef\n',
+    'alice,2023-12-02 19:27:00,22.22.22.22:48421,50ms,Alice,True,123456\n',
+    'short,row\n',
+]
+
+
+def run_and_capture(function, arguments):
+    """
+    Runs a subcommand and returns its return value and everything it printed.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        return_value = function(arguments)
+    return return_value, output.getvalue()
+
+
+class StatusTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.checkpoint_file_path = os.path.join(self.temporary_directory.name, 'checkpoint.dat')
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_save_checkpoint_and_status_round_trip(self):
+        server = Server()
+        server.apply_events(parse_log_lines(SAMPLE_LOG))
+        server.save_checkpoint(self.checkpoint_file_path)
+
+        return_value, output = run_and_capture(run_status, [self.checkpoint_file_path])
+
+        self.assertEqual(return_value, 0)
+        self.assertIn('Server Status: [GOOD]', output)
+        self.assertIn('Current Map: DM_Dockyard', output)
+        self.assertIn('Players: 1/16', output)
+        self.assertIn('boblol', output)
+        self.assertIn('11.11.11.11:48421', output)
+        self.assertIn('abcdef', output)
+
+    def test_missing_checkpoint(self):
+        return_value, output = run_and_capture(run_status, [self.checkpoint_file_path])
+
+        self.assertEqual(return_value, -1)
+        self.assertIn('One or more files were invalid or not found.', output)
+
+    def test_checkpoint_with_missing_keys(self):
+        with open(self.checkpoint_file_path, 'wb') as checkpoint_file:
+            marshal.dump({'current_world': 'DM_Dockyard'}, checkpoint_file)
+
+        return_value, output = run_and_capture(run_status, [self.checkpoint_file_path])
+
+        self.assertEqual(return_value, -1)
+        self.assertTrue(output.startswith('The checkpoint file could not be read.'))
+        self.assertNotIn('Current Map', output)
+
+    def test_checkpoint_that_is_not_marshal_data(self):
+        with open(self.checkpoint_file_path, 'wb') as checkpoint_file:
+            checkpoint_file.write(b'not a checkpoint')
+
+        return_value, output = run_and_capture(run_status, [self.checkpoint_file_path])
+
+        self.assertEqual(return_value, -1)
+        self.assertTrue(output.startswith('The checkpoint file could not be read.'))
+
+
+class HistoryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.player_data_file_path = os.path.join(self.temporary_directory.name, 'players.csv')
+        with open(self.player_data_file_path, 'w') as player_data_file:
+            player_data_file.writelines(PLAYER_DATA_ROWS)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_matches_name_ip_site_name_and_guid(self):
+        for search_term in ('boblol', '11.11.11.11', 'Bob', 'abcdef'):
+            return_value, output = run_and_capture(run_history, [self.player_data_file_path, search_term])
+
+            self.assertEqual(return_value, 0)
+            self.assertEqual(output, PLAYER_DATA_ROWS[0])
+
+    def test_skips_short_rows(self):
+        return_value, output = run_and_capture(run_history, [self.player_data_file_path, 'short'])
+
+        self.assertEqual(return_value, 0)
+        self.assertEqual(output, '')
+
+    def test_missing_player_data_file(self):
+        return_value, output = run_and_capture(run_history, [os.path.join(self.temporary_directory.name, 'nope.csv'),
+                                                             'boblol'])
+
+        self.assertEqual(return_value, -1)
+        self.assertIn('One or more files were invalid or not found.', output)
+
+
+if __name__ == '__main__':
+    unittest.main()